@@ -1,12 +1,45 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request
 import meteor_viz
+import numpy as np
 import neoWs
+import json
+import math
+import re
+import time
 from datetime import date, timedelta
-from energy_impact import energy_impact_estimation
+from energy_impact import energy_impact_estimation, energy_impact_batch
 from collections import OrderedDict
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:  # responses are sent uncompressed
+    Compress = None
 
 app = Flask(__name__)
 
+# Compress responses (HTML pages with the Plotly fragment, the JSON feed,
+# static CSS/JS) using Flask-Compress's default types and algorithms.
+if Compress is not None:
+    Compress(app)
+
+
+def _json_bytes(obj):
+    """Serialise obj to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_response(obj, status=200):
+    """jsonify replacement that encodes through _json_bytes."""
+    return Response(_json_bytes(obj), status=status, mimetype="application/json")
+
 # Simple in-memory LRU cache for generated visualisations to avoid
 # recomputing the Plotly fragment on repeated views. Small size to
 # bound memory usage; keys are asteroid IDs, values are HTML fragments.
@@ -32,7 +65,58 @@ def _get_cached_vis(asteroid_id, generator_fn):
     if len(_VIS_CACHE) > _VIS_CACHE_MAX:
         _VIS_CACHE.popitem(last=False)
     return html
-    return html
+
+
+# Short-lived cache for the hazardous-asteroid feed so repeated AJAX calls for
+# the same 7-day window skip the NeoWs round-trips, the row mapping and the
+# JSON encoding. Keys are (start, end) date strings, values are
+# (fetched_at, json_bytes).
+_NEO_CACHE = OrderedDict()
+_NEO_CACHE_MAX = 64
+_NEO_CACHE_TTL = 3600  # seconds
+
+
+def _get_cached_feed_json(key, generator_fn):
+    """Return the cached feed JSON for key while fresh, or generate and cache it.
+    Failures are not cached: exceptions from generator_fn propagate.
+    """
+    now = time.monotonic()
+    hit = _NEO_CACHE.get(key)
+    if hit is not None and now - hit[0] < _NEO_CACHE_TTL:
+        _NEO_CACHE.move_to_end(key)
+        return hit[1]
+    rows = generator_fn()
+    _NEO_CACHE[key] = (now, rows)
+    _NEO_CACHE.move_to_end(key)
+    if len(_NEO_CACHE) > _NEO_CACHE_MAX:
+        _NEO_CACHE.popitem(last=False)
+    return rows
+
+
+@lru_cache(maxsize=1)
+def _default_window(today):
+    """Return (one_week_ago, today) for the default 7-day window.
+    Keyed on today's date, so it is recomputed once per day.
+    """
+    return today - timedelta(days=7), today
+
+
+@lru_cache(maxsize=64)
+def _compute_window(start_str, today):
+    """Return the (start, end) ISO strings of the 7-day window for a requested start.
+
+    Invalid or missing starts fall back to one week ago, and starts later than
+    that are clamped so the window never ends after today. today is part of the
+    cache key, so cached windows roll over with the date.
+    """
+    one_week_ago, _ = _default_window(today)
+    try:
+        start_dt = date.fromisoformat(start_str)
+    except Exception:
+        start_dt = one_week_ago
+    if start_dt > one_week_ago:
+        start_dt = one_week_ago
+    return start_dt.isoformat(), (start_dt + timedelta(days=7)).isoformat()
 
 
 @app.route("/")
@@ -44,25 +128,12 @@ def start_page():
 def available_meteors():
     # show page with date pickers and optionally fetch data
     # default range: one week ago -> today
-    today = date.today()
-    one_week_ago = today - timedelta(days=7)
+    one_week_ago, today = _default_window(date.today())
 
     # allow overriding via query params
     # We enforce a fixed 7-day window. The user may provide a start date,
     # but it will be clamped so that the 7-day window ends no later than today.
-    start_str = request.args.get("start_date", one_week_ago.isoformat())
-    try:
-        start_dt = date.fromisoformat(start_str)
-    except Exception:
-        start_dt = one_week_ago
-
-    # Do not allow a start date later than one week ago (so end = start + 7 days <= today)
-    if start_dt > one_week_ago:
-        start_dt = one_week_ago
-
-    end_dt = start_dt + timedelta(days=7)
-    start = start_dt.isoformat()
-    end = end_dt.isoformat()
+    start, end = _compute_window(request.args.get("start_date"), today)
 
     # Do not fetch NeoWs data when rendering the page — only fetch via AJAX endpoint
     asteroids = None
@@ -80,18 +151,39 @@ def available_meteors():
     )
 
 
+# Placeholder info for the visualisation page when the lookup fails (read-only)
+_DEFAULT_ASTEROID_INFO = {
+    "name": "N/A",
+    "diameter": "N/A",
+    "closest_approach_date": "N/A",
+    "miss_distance": "N/A",
+    "velocity": "N/A",
+    "risk": "N/A",
+    "_raw": {}
+}
+
+
+@lru_cache(maxsize=1)
+def _viz_template():
+    """meteorViz.html resolved once per process."""
+    return app.jinja_env.get_template("meteorViz.html")
+
+
+def _render_viz_page(graph_html, asteroid_info):
+    """Render meteorViz.html from the cached template.
+    Falls back to render_template while templates auto-reload (debug) so edits show up.
+    """
+    if app.jinja_env.auto_reload:
+        return render_template("meteorViz.html", graph_html=graph_html, asteroid_info=asteroid_info)
+    context = {"graph_html": graph_html, "asteroid_info": asteroid_info}
+    app.update_template_context(context)
+    return _viz_template().render(context)
+
+
 @app.route("/meteors/visualize/<asteroid_id>")
 def visualize_asteroid(asteroid_id: str):
     # Default asteroid info (prevents Jinja error)
-    asteroid_info = {
-        "name": "N/A",
-        "diameter": "N/A",
-        "closest_approach_date": "N/A",
-        "miss_distance": "N/A",
-        "velocity": "N/A",
-        "risk": "N/A",
-        "_raw": {}
-    }
+    asteroid_info = _DEFAULT_ASTEROID_INFO
 
     graph_html = "<p>Visualisation not available.</p>"
 
@@ -106,7 +198,11 @@ def visualize_asteroid(asteroid_id: str):
                     return meteor_viz.simulate_sun_earth_asteroid(obj)
                 except TypeError:
                     return meteor_viz.simulate_sun_earth_asteroid()
-            graph_html = _get_cached_vis(asteroid_id, gen)
+            if request.args.get("static") == "1":
+                # static top-down SVG (no JavaScript), cached in meteor_viz
+                graph_html = meteor_viz.simulate_svg(obj)
+            else:
+                graph_html = _get_cached_vis(asteroid_id, gen)
         except Exception as e:
             graph_html = f"<p>Error generating visualisation: {e}</p>"
 
@@ -130,58 +226,118 @@ def visualize_asteroid(asteroid_id: str):
         graph_html = f"<p>Error fetching asteroid: {e}</p>"
 
     # Always render with asteroid_info (even if error)
-    return render_template("meteorViz.html", graph_html=graph_html, asteroid_info=asteroid_info)
+    return _render_viz_page(graph_html, asteroid_info)
 
 
-def _median_diameter_km(neo):
+def _safe_float(val, default=math.nan):
+    """float(val), or default when val is missing or not numeric.
+    NeoWs numbers arrive as floats or numeric strings; floats skip the conversion.
+    """
+    if type(val) is float:
+        return val
+    if val is None:
+        return default
     try:
-        d = neo.get("estimated_diameter", {}).get("kilometers", {})
-        mn = float(d.get("estimated_diameter_min"))
-        mx = float(d.get("estimated_diameter_max"))
-        return (mn + mx) / 2.0
-    except Exception:
-        return None
+        return float(val)
+    except (TypeError, ValueError):
+        return default
 
 
-def _closest_earth_approach(neo):
-    cad = neo.get("close_approach_data") or []
-    best = None
-    for ca in cad:
-        ob = str(ca.get("orbiting_body", "")).lower()
-        if ob != "earth":
-            continue
-        try:
-            miss = float(ca.get("miss_distance", {}).get("kilometers"))
-        except Exception:
-            continue
-        vel = None
-        try:
-            vel = float(ca.get("relative_velocity", {}).get("kilometers_per_second"))
-        except Exception:
-            vel = None
-        date = ca.get("close_approach_date_full") or ca.get("close_approach_date") or ""
-        if best is None or miss < best["missKm"]:
-            best = {"missKm": miss, "velKps": vel, "date": date}
-    return best
-
-
-def _map_neo_to_row(neo):
-    dKm = _median_diameter_km(neo)
-    ca = _closest_earth_approach(neo)
-    missKm = ca["missKm"] if ca else None
-    velKps = ca["velKps"] if ca else None
-    hazard = (dKm / missKm) if (dKm is not None and missKm) else None
-    return {
-        "id": neo.get("id"),
-        "name": neo.get("name") or neo.get("designation") or neo.get("neo_reference_id"),
-        "jpl_url": neo.get("nasa_jpl_url"),
-        "approach_date": ca["date"] if ca else None,
-        "diameter_km": dKm,
-        "miss_distance_km": missKm,
-        "velocity_kps": velKps,
-        "hazard_score": hazard,
-        "_raw": neo,
-    }
+def _diameter_range_km(neo):
+    """(min, max) estimated diameter in km, nan for missing or invalid values."""
+    d = neo.get("estimated_diameter", {}).get("kilometers", {})
+    return _safe_float(d.get("estimated_diameter_min")), _safe_float(d.get("estimated_diameter_max"))
+
+
+def _nan_to_none(values):
+    """Convert a float array to a list with None in place of nan (JSON null)."""
+    return [None if math.isnan(x) else x for x in values.tolist()]
+
+
+def _map_neo_rows(neos):
+    """Map a batch of NeoWs objects to flat table rows.
+
+    The Earth close approaches of the whole batch are first flattened into
+    columns (owner index, miss distance, velocity, date); the closest approach
+    of every object is then picked in a single pass over those columns. The
+    per-object numbers (diameter, miss distance, velocity, hazard score,
+    energy) are computed as NumPy columns with nan marking missing values.
+    """
+    owner, miss, vel, when = [], [], [], []
+    for idx, neo in enumerate(neos):
+        for ca in neo.get("close_approach_data") or []:
+            if str(ca.get("orbiting_body", "")).lower() != "earth":
+                continue
+            m = _safe_float(ca.get("miss_distance", {}).get("kilometers"), None)
+            if m is None:
+                continue
+            owner.append(idx)
+            miss.append(m)
+            vel.append(_safe_float(ca.get("relative_velocity", {}).get("kilometers_per_second")))
+            when.append(ca.get("close_approach_date_full") or ca.get("close_approach_date") or "")
+
+    n = len(neos)
+    if not n:
+        return []
+
+    # index of the closest approach per object: sort by (owner, miss) and take
+    # the first entry of every owner run (lexsort is stable, so ties keep the
+    # earliest approach)
+    miss_km = np.full(n, np.nan)
+    vel_kps = np.full(n, np.nan)
+    best = [None] * n
+    if owner:
+        owner_arr = np.asarray(owner, dtype=np.intp)
+        miss_arr = np.asarray(miss, dtype=np.float64)
+        order = np.lexsort((miss_arr, owner_arr))
+        owners, first = np.unique(owner_arr[order], return_index=True)
+        picks = order[first]
+        miss_km[owners] = miss_arr[picks]
+        vel_kps[owners] = np.asarray(vel, dtype=np.float64)[picks]
+        for idx, j in zip(owners.tolist(), picks.tolist()):
+            best[idx] = j
+
+    d_range = np.array([_diameter_range_km(neo) for neo in neos], dtype=np.float64)
+    d_min, d_max = d_range[:, 0], d_range[:, 1]
+    d_med = 0.5 * (d_min + d_max)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        hazard = np.where(miss_km > 0, d_med / miss_km, np.nan)
+    energy = energy_impact_batch(d_max, d_min, vel_kps)
+
+    rows = []
+    for neo, j, dKm, missKm, velKps, score, mt in zip(
+        neos, best, _nan_to_none(d_med), _nan_to_none(miss_km), _nan_to_none(vel_kps),
+        _nan_to_none(hazard), _nan_to_none(energy),
+    ):
+        rows.append({
+            "id": neo.get("id"),
+            "name": neo.get("name") or neo.get("designation") or neo.get("neo_reference_id"),
+            "jpl_url": neo.get("nasa_jpl_url"),
+            "approach_date": when[j] if j is not None else None,
+            "diameter_km": dKm,
+            "miss_distance_km": missKm,
+            "velocity_kps": velKps,
+            "hazard_score": score,
+            "energy_mt": mt,
+            "_raw": neo,
+        })
+    return rows
+
+
+# Query parameters of /api/energy with their defaults, and the accepted
+# number syntax (plain non-negative decimal, optional exponent).
+_ENERGY_PARAMS = (("diameter_m", "0"), ("velocity_kms", "0"), ("density_kg_m3", "3000"))
+_NUMBER_RE = re.compile(r"(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?")
+
+# Ring radius per cube root of megatons, in meters (same formula as the client)
+_RING_FACTORS_M = np.array([1200.0, 3200.0, 7000.0])
+
+
+def _ring_radii_m(mt):
+    """Ring radii in meters for energies in Mt: shape (3,) for a scalar,
+    (N, 3) for an array of N energies (cube-root scaling).
+    """
+    return np.cbrt(np.asarray(mt, dtype=np.float64))[..., None] * _RING_FACTORS_M
 
 
 # Internal AJAX endpoint to compute impact energy and ring radii
@@ -194,55 +350,74 @@ def api_energy():
       velocity_kms (required) - km/s
       density_kg_m3 (optional) - default 3000
     """
+    values = {}
+    for name, default in _ENERGY_PARAMS:
+        raw = request.args.get(name, default)
+        # the syntax check still admits overflowing exponents such as 1e999 (inf)
+        if not _NUMBER_RE.fullmatch(raw) or not math.isfinite(float(raw)):
+            return _json_response({"error": f"{name} must be a finite non-negative number, got {raw!r}"}, 400)
+        values[name] = float(raw)
+
+    # use single-value estimation: pass same value as min/max in km
+    d_km = values["diameter_m"] / 1000.0
+    mt = energy_impact_estimation(d_km, d_km, values["velocity_kms"], values["density_kg_m3"])
+    if not math.isfinite(mt):
+        return _json_response({"error": "energy out of range for the given inputs"}, 400)
+    return _json_response({"mt": mt, "rings_m": _ring_radii_m(mt).tolist()})
+
+
+@app.route("/api/energy/batch", methods=["POST"])
+def api_energy_batch():
+    """
+    Batch version of /api/energy for several asteroids in one request.
+    JSON body:
+      diameters_m (required) - list of diameters in meters
+      velocities_kms (required) - list of velocities in km/s, same length
+      density_kg_m3 (optional) - default 3000
+    Returns {"mt": [...], "rings_m": [[r1, r2, r3], ...]}.
+    """
     try:
-        diameter_m = float(request.args.get('diameter_m', '0'))
-        velocity_kms = float(request.args.get('velocity_kms', '0'))
-        density_kg_m3 = float(request.args.get('density_kg_m3', '3000'))
-        # use single-value estimation: pass same value as min/max in km
-        d_km = diameter_m / 1000.0
-        mt = energy_impact_estimation(d_km, d_km, velocity_kms, density_kg_m3)
-        # cube-root scaling for radii (same formula as client)
-        r20km = 1.2 * (mt ** (1/3))
-        r5km = 3.2 * (mt ** (1/3))
-        r1km = 7.0 * (mt ** (1/3))
-        rings_m = [r20km * 1000, r5km * 1000, r1km * 1000]
-        return jsonify({"mt": mt, "rings_m": rings_m})
+        raw = request.get_data()
+        body = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        d_km = np.asarray(body["diameters_m"], dtype=np.float64) / 1000.0
+        v = np.asarray(body["velocities_kms"], dtype=np.float64)
+        if d_km.ndim != 1 or d_km.shape != v.shape:
+            raise ValueError("diameters_m and velocities_kms must be lists of equal length")
+        density_kg_m3 = float(body.get("density_kg_m3", 3000))
+        if not (np.isfinite(d_km).all() and np.isfinite(v).all() and math.isfinite(density_kg_m3)):
+            raise ValueError("diameters_m, velocities_kms and density_kg_m3 must be finite")
+        with np.errstate(over="ignore"):
+            mt = energy_impact_batch(d_km, d_km, v, density_kg_m3)
+        if not np.isfinite(mt).all():
+            raise ValueError("energy out of range for the given inputs")
+        return _json_response({"mt": mt.tolist(), "rings_m": _ring_radii_m(mt).tolist()})
     except Exception as e:
-        return jsonify({"error": str(e)}), 400
-
-# Internal AJAX endpoint to fetch hazardous asteroids for a date range
+        return _json_response({"error": str(e)}, 400)
 
 
+# Internal AJAX endpoint to fetch hazardous asteroids for a date range
 @app.route("/available_meteors.json")
 def available_meteors_json():
     # Return JSON for the requested start date window. This is called by the client via AJAX.
-    today = date.today()
-    one_week_ago = today - timedelta(days=7)
-    start_str = request.args.get("start_date", one_week_ago.isoformat())
-    try:
-        start_dt = date.fromisoformat(start_str)
-    except Exception:
-        start_dt = one_week_ago
-    if start_dt > one_week_ago:
-        start_dt = one_week_ago
-    end_dt = start_dt + timedelta(days=7)
-    start = start_dt.isoformat()
-    end = end_dt.isoformat()
+    start, end = _compute_window(request.args.get("start_date"), date.today())
 
     print(f"[SERVER] JSON endpoint called; start={start} end={end}")
-    try:
+
+    def gen():
         rows = neoWs.get_hazardous_asteroids(start, end)
         # If the API returned full NeoWs objects, map them to flat rows
         if isinstance(rows, list) and rows and isinstance(rows[0], dict) and "estimated_diameter" in rows[0]:
-            mapped = [_map_neo_to_row(r) for r in rows if r.get("is_potentially_hazardous_asteroid")]
-            print(f"[SERVER] JSON endpoint returning {len(mapped)} mapped rows")
-            return jsonify(mapped)
+            rows = _map_neo_rows([r for r in rows if r.get("is_potentially_hazardous_asteroid")])
         # otherwise return as-is
-        print(f"[SERVER] JSON endpoint returning {len(rows) if isinstance(rows, list) else 'unknown'} items")
-        return jsonify(rows)
+        print(f"[SERVER] JSON endpoint fetched {len(rows) if isinstance(rows, list) else 'unknown'} items")
+        return _json_bytes(rows)
+
+    try:
+        body = _get_cached_feed_json((start, end), gen)
+        return Response(body, mimetype="application/json")
     except Exception as e:
         print(f"[SERVER] JSON endpoint error: {e}")
-        return jsonify({"error": str(e)}), 500
+        return _json_response({"error": str(e)}, 500)
 
 
 @app.route("/map")
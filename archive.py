@@ -6,12 +6,20 @@ stores them in a database for later retrieval.
 import sqlite3
 import os
 import json
-import copy
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json module
+    orjson = None
 
 # constants
 api_browse_url = "https://api.nasa.gov/neo/rest/v1/neo/browse"
@@ -20,42 +28,61 @@ request_timeout = 10  # seconds
 database_file = "asteroids.db"
 PAGE_SIZE = 20  # fixed page size (do not change unless you know what you're doing)
 START_PAGE = 1036  # change this constant to resume from a specific page (1-indexed)
-RETRIES = 3  # number of attempts for HTTP requests
+RETRIES = 3  # number of attempts for HTTP requests (first try + retries)
 BACKOFF_FACTOR = 1.0  # backoff multiplier in seconds
-RATE_LIMIT_SLEEP = 0.12  # seconds to sleep between requests to avoid hammering the API
+RATE_LIMIT_SLEEP = 0.12  # minimum spacing in seconds between request starts (shared by all threads)
+LOOKUP_WORKERS = 8  # concurrent lookups per page
+
+_rate_lock = threading.Lock()
+_next_request_at = 0.0
+
+
+# One pooled keep-alive session shared by all lookup threads. Transient
+# failures (connection errors, 429 and 5xx responses) are retried by urllib3
+# with exponential backoff.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=RETRIES - 1,
+            backoff_factor=BACKOFF_FACTOR,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        ),
+    ),
+)
 
 
 def _request_json(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
-    """http get and return parsed json (single attempt). Use callers' retry wrapper."""
-    r = requests.get(url, params=params, timeout=request_timeout)
+    """http get and return parsed json (retries are handled by the session adapter)."""
+    r = _SESSION.get(url, params=params, timeout=request_timeout)
     r.raise_for_status()
+    if orjson is not None:
+        return orjson.loads(r.content)
     return r.json()
 
 
-def _request_json_with_retries(url: str, params: Dict[str, Any], attempts: int = RETRIES) -> Dict[str, Any]:
-    """Make an HTTP GET with a small retry/backoff loop. Raises the last exception on failure.
+def _wait_for_rate_limit() -> None:
+    """block until this thread may start a request; spaces requests RATE_LIMIT_SLEEP apart."""
+    global _next_request_at
+    with _rate_lock:
+        now = time.monotonic()
+        wait = _next_request_at - now
+        _next_request_at = max(now, _next_request_at) + RATE_LIMIT_SLEEP
+    if wait > 0:
+        time.sleep(wait)
 
-    Also sleeps a short amount after a successful request to apply a lightweight rate limit.
+
+def _request_json_with_retries(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Rate-limited HTTP GET; the session retries transient failures up to RETRIES attempts.
+
+    Every call waits for its slot in the shared rate limit, so concurrent callers stay polite.
     """
-    last_exc = None
-    for attempt in range(1, attempts + 1):
-        try:
-            res = _request_json(url, params)
-            # polite small sleep after a successful request
-            time.sleep(RATE_LIMIT_SLEEP)
-            return res
-        except Exception as exc:
-            last_exc = exc
-            if attempt >= attempts:
-                # give up
-                raise
-            # backoff sleep before next attempt
-            backoff = BACKOFF_FACTOR * attempt
-            time.sleep(backoff)
-    # if somehow we exit loop without returning, raise
-    if last_exc:
-        raise last_exc
-    raise RuntimeError("_request_json_with_retries failed without exception")
+    _wait_for_rate_limit()
+    return _request_json(url, params)
 
 
 def _neo_browse(page: int) -> Dict[str, Any]:
@@ -67,23 +94,28 @@ def _neo_browse(page: int) -> Dict[str, Any]:
 api_lookup_url_template = "https://api.nasa.gov/neo/rest/v1/neo/{id}"
 
 
-def _neo_lookup(asteroid_id: str) -> Dict[str, Any]:
-    """lookup detailed asteroid record by id (no caching)"""
+def _neo_lookup_remote(asteroid_id: str) -> Dict[str, Any]:
+    """lookup detailed asteroid record by id over HTTP"""
     url = api_lookup_url_template.format(id=asteroid_id)
     return _request_json_with_retries(url, {"api_key": default_api_key})
 
 
+# non-metric keys dropped from close_approach_data entries
+_POP_MISS = ("lunar", "miles")
+_POP_REL = ("miles_per_hour", "miles_per_hr")
+
+
 def _sanitise_approach(approach: Dict[str, Any]) -> None:
     """remove non-metric fields from a close_approach_data entry."""
     miss = approach.get("miss_distance")
     if isinstance(miss, dict):
-        miss.pop("lunar", None)
-        miss.pop("miles", None)
+        for key in _POP_MISS:
+            miss.pop(key, None)
 
     rel = approach.get("relative_velocity")
     if isinstance(rel, dict):
-        rel.pop("miles_per_hour", None)
-        rel.pop("miles_per_hr", None)
+        for key in _POP_REL:
+            rel.pop(key, None)
 
 
 def _simplify_estimated_diameter(obj: Dict[str, Any]) -> None:
@@ -96,39 +128,37 @@ def _simplify_estimated_diameter(obj: Dict[str, Any]) -> None:
 
 
 def _simplify_object_lookup(obj_lookup: Dict[str, Any], approaches_from_browse: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """prepare a version of the full lookup object constrained to the browse approaches.
+    """constrain a freshly fetched lookup object to the browse approaches, in place.
 
     This mirrors the behaviour in `neoWs.py` and produces objects similar to `meteor.json`.
     """
-    obj_copy = copy.deepcopy(obj_lookup)
-    obj_copy["close_approach_data"] = approaches_from_browse or []
+    obj_lookup["close_approach_data"] = approaches_from_browse or []
 
-    for approach in obj_copy.get("close_approach_data", []):
+    for approach in obj_lookup["close_approach_data"]:
         _sanitise_approach(approach)
 
-    _simplify_estimated_diameter(obj_copy)
+    _simplify_estimated_diameter(obj_lookup)
 
     # remove top-level links if present
-    obj_copy.pop("links", None)
+    obj_lookup.pop("links", None)
 
-    return obj_copy
+    return obj_lookup
+
+
+def _km_or_nan(approach: Dict[str, Any]) -> float:
+    """miss distance in kilometers of one approach, nan if missing or invalid"""
+    try:
+        return float(approach.get("miss_distance", {}).get("kilometers"))
+    except (TypeError, ValueError):
+        return np.nan
 
 
 def _min_miss_km(item: Dict[str, Any]) -> float:
     """compute smallest miss distance in kilometers for an object's approaches"""
     approaches = item.get("close_approach_data", [])
-    min_km = float("inf")
-    for a in approaches:
-        try:
-            km_str = a.get("miss_distance", {}).get("kilometers")
-            if km_str is None:
-                continue
-            km = float(km_str)
-            if km < min_km:
-                min_km = km
-        except (TypeError, ValueError):
-            continue
-    return min_km
+    kms = np.fromiter((_km_or_nan(a) for a in approaches), dtype=np.float64, count=len(approaches))
+    kms = kms[~np.isnan(kms)]
+    return float(kms.min()) if kms.size else float("inf")
 
 
 def _create_db(conn: sqlite3.Connection) -> None:
@@ -145,24 +175,38 @@ def _create_db(conn: sqlite3.Connection) -> None:
     conn.commit()
 
 
-def _insert_asteroid(conn: sqlite3.Connection, obj: Dict[str, Any]) -> int:
-    """Insert simplified asteroid object into DB using INSERT OR IGNORE.
+def _existing_ids(conn: sqlite3.Connection, ids: List[str]) -> set:
+    """return the subset of ids already stored, in one query"""
+    if not ids:
+        return set()
+    placeholders = ",".join("?" * len(ids))
+    cur = conn.execute(f"SELECT id FROM asteroids WHERE id IN ({placeholders})", ids)
+    return {row[0] for row in cur}
+
 
-    Returns 1 if inserted, 0 if ignored.
+def _asteroid_row(obj: Dict[str, Any], inserted_at: str) -> Optional[tuple]:
+    """Build the (id, data, inserted_at) row for a simplified asteroid object.
+
+    inserted_at is shared by the whole page. Returns None if the object has no id.
     """
     aid = obj.get("id") or obj.get("neo_reference_id")
     if not aid:
+        return None
+    data_text = orjson.dumps(obj).decode("utf-8") if orjson is not None else json.dumps(obj, ensure_ascii=False)
+    return (str(aid), data_text, inserted_at)
+
+
+def _insert_asteroids(conn: sqlite3.Connection, rows: List[tuple]) -> int:
+    """Insert a batch of asteroid rows in one transaction using INSERT OR IGNORE.
+
+    Returns the number of rows actually inserted.
+    """
+    if not rows:
         return 0
-    data_text = json.dumps(obj, ensure_ascii=False)
     cur = conn.cursor()
-    before = conn.total_changes
-    cur.execute(
-        "INSERT OR IGNORE INTO asteroids(id, data, inserted_at) VALUES (?, ?, ?)",
-        (str(aid), data_text, datetime.utcnow().isoformat() + "Z"),
-    )
+    cur.executemany("INSERT OR IGNORE INTO asteroids(id, data, inserted_at) VALUES (?, ?, ?)", rows)
     conn.commit()
-    after = conn.total_changes
-    return 1 if (after - before) > 0 else 0
+    return cur.rowcount
 
 
 def run(start_page: int = START_PAGE) -> None:
@@ -170,13 +214,26 @@ def run(start_page: int = START_PAGE) -> None:
 
     The function will iterate pages (size=PAGE_SIZE) and store simplified lookup
     objects into the sqlite database. Progress is printed as pages complete with
-    elapsed time. If interrupted, it can be restarted using the same START_PAGE
-    and already-stored asteroids will be skipped due to INSERT OR IGNORE.
+    elapsed time. If interrupted, it can be restarted using the same START_PAGE:
+    asteroids already stored are found with one query per page and skipped
+    before they are looked up.
     """
     conn = sqlite3.connect(database_file, timeout=30)
-    _create_db(conn)
+    try:
+        # WAL + NORMAL sync: one cheap commit per page instead of a full fsync per row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _create_db(conn)
+
+        # lookups of a page run concurrently; the database is only touched from this thread
+        with ThreadPoolExecutor(max_workers=LOOKUP_WORKERS) as pool:
+            _crawl(conn, pool, int(start_page))
+    finally:
+        conn.close()
 
-    page = int(start_page)
+
+def _crawl(conn: sqlite3.Connection, pool: ThreadPoolExecutor, page: int) -> None:
+    """page loop of `run`: browse, look up and store pages from `page` onwards."""
     start_time = time.time()
 
     # fetch the first page to learn total_pages
@@ -184,7 +241,6 @@ def run(start_page: int = START_PAGE) -> None:
         first = _neo_browse(page)
     except Exception as exc:
         print(f"Failed to fetch page {page}: {exc}")
-        conn.close()
         return
 
     page_info = first.get("page") or {}
@@ -206,22 +262,36 @@ def run(start_page: int = START_PAGE) -> None:
             print(f"No objects on page {page}, stopping.")
             break
 
-        inserted_this_page = 0
+        # asteroids already archived are skipped before any lookup or
+        # serialisation (they would only be ignored by INSERT OR IGNORE);
+        # the rest are fetched in parallel
+        page_ids = [str(obj.get("neo_reference_id") or obj.get("id")) for obj in objects
+                    if obj.get("neo_reference_id") or obj.get("id")]
+        existing = _existing_ids(conn, page_ids)
+        pending = {}
+        for neo_id in page_ids:
+            if neo_id not in existing and neo_id not in pending:
+                pending[neo_id] = pool.submit(_neo_lookup_remote, neo_id)
+
+        batch = []
+        inserted_at = datetime.utcnow().isoformat() + "Z"  # one timestamp per page
         for obj in objects:
             neo_id = obj.get("neo_reference_id") or obj.get("id")
-            if not neo_id:
+            if not neo_id or str(neo_id) not in pending:
                 continue
             try:
-                lookup = _neo_lookup(neo_id)
+                lookup = pending.pop(str(neo_id)).result()
             except Exception as exc:
                 print(f"Failed lookup for {neo_id} on page {page}: {exc}")
                 continue
 
             approaches_from_browse = obj.get("close_approach_data", [])
             simplified = _simplify_object_lookup(lookup, approaches_from_browse)
-            inserted_this_page += _insert_asteroid(conn, simplified)
+            row = _asteroid_row(simplified, inserted_at)
+            if row is not None:
+                batch.append(row)
 
-    # after_changes not needed; inserted_this_page counts new inserts
+        inserted_this_page = _insert_asteroids(conn, batch)
         elapsed = time.time() - start_time
         # print progress with page number, total pages (if known), elapsed and inserts
         if total_pages and isinstance(total_pages, int):
@@ -235,8 +305,6 @@ def run(start_page: int = START_PAGE) -> None:
 
         page += 1
 
-    conn.close()
-
 
 if __name__ == "__main__":
     # allow overriding start page via env var if desired
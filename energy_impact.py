@@ -7,18 +7,20 @@ Based on assumptions:
 """
 
 import math
+import numpy as np
+
+JOULES_PER_MEGATON_TNT = 4.184e15
+
+# Folded constants: KE [Mt] = _KE_COEFF * m [kg] * v^2 [(km/s)^2] and
+# sphere volume = _VOL_COEFF * d^3
+_KE_COEFF = 0.5 * 1_000_000.0 / JOULES_PER_MEGATON_TNT
+_VOL_COEFF = math.pi / 6.0
 
 
 def energy_impact(mass_kg: float, velocity_km_s: float) -> float:
     """Computes kinetic energy in megatons of TNT for a given mass (kg) and velocity (km/s)."""
-    # KE = 1/2 m v^2
-    velocity_m_s = velocity_km_s * 1000
-    ke_joules = 0.5 * mass_kg * (velocity_m_s ** 2)
-
-    # Convert joules to megatons of TNT
-    joules_per_megaton_tnt = 4.184e15
-    ke_megatons = ke_joules / joules_per_megaton_tnt
-    return ke_megatons
+    # KE = 1/2 m v^2, with the m/s and joules -> megatons conversions folded into _KE_COEFF
+    return _KE_COEFF * mass_kg * velocity_km_s * velocity_km_s
 
 
 def energy_impact_estimation(
@@ -26,17 +28,25 @@ def energy_impact_estimation(
 ) -> float:
     """Estimates a single kinetic energy value in megatons of TNT based on the average diameter."""
 
-    avg_diameter_km = (min_diameter_km + max_diameter_km) / 2
-    avg_radius_m = (avg_diameter_km * 1000) / 2
-
-    # Calculate volume from the average radius
-    volume_m3 = (4/3) * math.pi * (avg_radius_m ** 3)
+    avg_diameter_m = (min_diameter_km + max_diameter_km) * 500.0
 
-    # Calculate mass from the volume
-    mass_kg = density_kg_m3 * volume_m3
+    # Calculate mass from the volume of the average-diameter sphere
+    mass_kg = density_kg_m3 * _VOL_COEFF * (avg_diameter_m * avg_diameter_m * avg_diameter_m)
 
     # Return a single kinetic energy value
-    return energy_impact(mass_kg, velocity_km_s)
+    return _KE_COEFF * mass_kg * velocity_km_s * velocity_km_s
+
+
+def energy_impact_batch(max_diameter_km, min_diameter_km, velocity_km_s, density_kg_m3: float = 3000) -> np.ndarray:
+    """Vectorised energy_impact_estimation over arrays of asteroids (Mt TNT).
+
+    Missing inputs should be passed as nan; they yield nan in the output.
+    """
+    max_d = np.asarray(max_diameter_km, dtype=np.float64)
+    min_d = np.asarray(min_diameter_km, dtype=np.float64)
+    v = np.asarray(velocity_km_s, dtype=np.float64)
+    d = (min_d + max_d) * 500.0  # average diameter in m
+    return (_KE_COEFF * density_kg_m3 * _VOL_COEFF) * (d * d * d) * (v * v)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,34 @@
+"""
+Gunicorn settings for production: ``gunicorn -c gunicorn.conf.py``.
+
+With gevent installed, each worker serves many requests concurrently while
+they wait on the NeoWs API. Without it, workers fall back to threads.
+"""
+
+import multiprocessing
+
+try:
+    # Patch before the app (and requests/ssl) is preloaded in the master.
+    from gevent import monkey
+    monkey.patch_all()
+    _have_gevent = True
+except ImportError:
+    _have_gevent = False
+
+wsgi_app = "wsgi:app"
+# Load the app, Plotly and the compiled kernels once and share them via fork.
+# This is only safe because every Numba kernel in the app is serial: a
+# parallel (prange) kernel run in the master breaks forked workers under the
+# OpenMP threading layer, and the gthread workers below would enter it from
+# several threads at once, which aborts under the default workqueue layer.
+# Keep kernels serial, or drop preload_app and use NUMBA_THREADING_LAYER=tbb.
+preload_app = True
+
+workers = 2 * multiprocessing.cpu_count() + 1
+if _have_gevent:
+    worker_class = "gevent"
+    worker_connections = 1000
+else:
+    worker_class = "gthread"
+    threads = 2
+keepalive = 5
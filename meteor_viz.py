@@ -14,8 +14,20 @@ Goals:
 - Return an HTML/SVG fragment that can be embedded directly in templates.
 """
 
+import itertools
+import math
 import numpy as np
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+# Numba is optional: when available the per-sample orbit propagation runs as a
+# compiled loop, otherwise the vectorised NumPy path below is used.
+try:
+    from numba import njit
+    _have_numba = True
+except Exception:
+    njit = None
+    _have_numba = False
 
 # ====================================
 # Constants
@@ -40,18 +52,66 @@ T_earth = 365.25 * 24 * 3600
 
 # Default simulation setup
 DEFAULT_DAYS = 365
+DEFAULT_SAMPLES = 90  # animation time steps over DEFAULT_DAYS
 DT = 60 * 60 * 24  # 1 day
+MAX_ANIMATION_FRAMES = 60  # upper bound on frames / slider steps per figure
+
+# Animation options shared by every slider step (identical for all steps).
+_SLIDER_STEP_ARGS = dict(mode='immediate', frame=dict(duration=0, redraw=True), transition=dict(duration=0))
+
+# Per-process counter for plot div ids (cheaper than plotly's default uuid4).
+_PLOT_UID = itertools.count()
+# Stand-in div id in cached fragments, replaced by a fresh one per call.
+_DIV_ID_PLACEHOLDER = "orbit_plot___div_id__"
+
+# Background star field in units of the scene half-width (fewer stars -> less
+# initial payload). Fixed seed so every figure shows the same sky; each figure
+# only rescales it to its own axis range.
+_STAR_FIELD = np.random.default_rng(42).uniform(-0.95, 0.95, (3, 120))
 
 
 # Orbital mechanics functions
 
-def kepler_E(M, e, tol=1e-12):
-    E = M if e < 0.8 else np.pi
-    while True:
-        dE = (E - e * np.sin(E) - M) / (1 - e * np.cos(E))
-        E -= dE
-        if abs(dE) < tol:
-            break
+def _kepler_iterate(E, M, e, tol, max_iter):
+    """Refine Kepler's equation from the starting guess `E` with Danby's
+    quartic step: one sin/cos pair per pass gives f and its first three
+    derivatives, so about half as many passes as Newton are needed.
+
+    Returns the refined anomalies and whether the largest correction fell
+    below `tol` within `max_iter` steps.
+    """
+    for _ in range(max_iter):
+        es, ec = e * np.sin(E), e * np.cos(E)
+        f = E - es - M
+        fp = 1 - ec
+        d1 = -f / fp
+        d2 = -f / (fp + 0.5 * d1 * es)
+        dE = -f / (fp + 0.5 * d2 * es + (d2 * d2 / 6) * ec)
+        E += dE
+        if np.max(np.abs(dE)) < tol:
+            return E, True
+    return E, False
+
+
+def kepler_E(M, e, tol=1e-10, max_iter=10):
+    """Solve Kepler's equation for the eccentric anomaly.
+
+    `M` may be a scalar or an array of mean anomalies; each (Danby) update is
+    applied to the whole array at once. The iteration is seeded with the
+    third-order series in `e` so one or two steps usually suffice; very
+    eccentric orbits that fail to converge are restarted from E = pi.
+    """
+    M = np.asarray(M, dtype=float)
+    sM = np.sin(M)
+    E0 = M + e * sM + 0.5 * e * e * np.sin(2 * M) + (e ** 3 / 8) * (3 * np.sin(3 * M) - sM)
+    E, converged = _kepler_iterate(E0, M, e, tol, max_iter)
+    if not converged:
+        # `e` may be an array broadcasting against `M` (several orbits at once);
+        # only the very eccentric ones are restarted
+        restart = np.broadcast_to(np.asarray(e) >= 0.95, E.shape)
+        if restart.any():
+            E_pi, _ = _kepler_iterate(np.full_like(E, np.pi), M, e, tol, max_iter)
+            E = np.where(restart, E_pi, E)
     return E
 
 
@@ -62,10 +122,111 @@ def true_anomaly(E, e):
     )
 
 
+if _have_numba:
+    @njit(fastmath=True, cache=True)
+    def _kepler_step(E, M, e):
+        """Scalar Danby correction for Kepler's equation (see _kepler_iterate)."""
+        es = e * math.sin(E)
+        ec = e * math.cos(E)
+        f = E - es - M
+        fp = 1.0 - ec
+        d1 = -f / fp
+        d2 = -f / (fp + 0.5 * d1 * es)
+        return -f / (fp + 0.5 * d2 * es + (d2 * d2 / 6.0) * ec)
+
+    @njit(fastmath=True, cache=True)
+    def _propagate_kernel(a, e, i, T, t_seconds, M0, omega, Omega, tol, max_iter, out):
+        """Compiled counterpart of `position_from_elements` for a vector of
+        sample times; writes x, y and z into the rows of the preallocated
+        (3, N) array `out` (structure-of-arrays layout).
+        """
+        cO, sO = math.cos(Omega), math.sin(Omega)
+        cw, sw = math.cos(omega), math.sin(omega)
+        ci, si = math.cos(i), math.sin(i)
+        r11 = cO * cw - sO * sw * ci
+        r12 = -cO * sw - sO * cw * ci
+        r21 = sO * cw + cO * sw * ci
+        r22 = -sO * sw + cO * cw * ci
+        r31 = sw * si
+        r32 = cw * si
+        two_pi = 2.0 * math.pi
+        p = a * (1.0 - e * e)
+        qp = math.sqrt(1.0 + e)
+        qm = math.sqrt(1.0 - e)
+        for k in range(t_seconds.shape[0]):
+            M = (two_pi * (t_seconds[k] / T) + M0) % two_pi
+            sM = math.sin(M)
+            E = M + e * sM + 0.5 * e * e * math.sin(2.0 * M) + (e * e * e / 8.0) * (3.0 * math.sin(3.0 * M) - sM)
+            converged = False
+            for _ in range(max_iter):
+                dE = _kepler_step(E, M, e)
+                E += dE
+                if abs(dE) < tol:
+                    converged = True
+                    break
+            if not converged and e >= 0.95:
+                E = math.pi
+                for _ in range(max_iter):
+                    dE = _kepler_step(E, M, e)
+                    E += dE
+                    if abs(dE) < tol:
+                        break
+            nu = 2.0 * math.atan2(qp * math.sin(0.5 * E), qm * math.cos(0.5 * E))
+            cnu = math.cos(nu)
+            snu = math.sin(nu)
+            r = p / (1.0 + e * cnu)
+            x_orb = r * cnu
+            y_orb = r * snu
+            out[0, k] = r11 * x_orb + r12 * y_orb
+            out[1, k] = r21 * x_orb + r22 * y_orb
+            out[2, k] = r31 * x_orb + r32 * y_orb
+        return out
+
+    # Serial on purpose: faster than prange at these sizes, and safe with
+    # preloaded, threaded gunicorn workers (see gunicorn.conf.py).
+    @njit(fastmath=True, cache=True)
+    def _propagate_many_kernel(a, e, i, T, t_seconds, M0, omega, Omega, tol, max_iter, out):
+        """Propagate B bodies over a shared time grid; element arguments are
+        length-B arrays and `out` has shape (B, 3, N).
+        """
+        for b in range(a.shape[0]):
+            _propagate_kernel(a[b], e[b], i[b], T[b], t_seconds, M0[b], omega[b], Omega[b],
+                              tol, max_iter, out[b])
+        return out
+
+
+def orbit_rotation_matrix(i, omega, Omega):
+    """Orbital-plane to ecliptic rotation P = R_z(Omega) R_x(i) R_z(omega).
+
+    Angles may be arrays; the result has shape `broadcast(i, omega, Omega) + (3, 3)`.
+    """
+    cO, sO = np.cos(Omega), np.sin(Omega)
+    cw, sw = np.cos(omega), np.sin(omega)
+    ci, si = np.cos(i), np.sin(i)
+    cO, sO, cw, sw, ci, si = np.broadcast_arrays(cO, sO, cw, sw, ci, si)
+    zero = np.zeros_like(ci)
+    return np.stack([
+        np.stack([cO * cw - sO * sw * ci, -cO * sw - sO * cw * ci, sO * si], axis=-1),
+        np.stack([sO * cw + cO * sw * ci, -sO * sw + cO * cw * ci, -cO * si], axis=-1),
+        np.stack([sw * si, cw * si, ci + zero], axis=-1),
+    ], axis=-2)
+
+
 def position_from_elements(a, e, i, T, t_seconds, M0=0.0, omega=0.0, Omega=0.0):
     """Compute heliocentric 3D position including inclination, argument of
     perihelion, and longitude of node.
+
+    `t_seconds` may be a scalar (returns shape (3,)) or an array of sample
+    times (returns shape (N, 3)). Array results are stored as three contiguous
+    x/y/z rows and returned as a transposed view, so `pos[:, k]` columns are
+    contiguous when handed to Plotly or the SVG builder. The NumPy path also
+    broadcasts: (B, 1) elements against (1, N) times give shape (B, N, 3).
     """
+    if _have_numba and np.ndim(t_seconds) == 1:
+        t = np.ascontiguousarray(t_seconds, dtype=np.float64)
+        out = np.empty((3, t.shape[0]))
+        return _propagate_kernel(float(a), float(e), float(i), float(T), t, float(M0),
+                                 float(omega), float(Omega), 1e-10, 10, out).T
     M = (2 * np.pi * (t_seconds / T) + M0) % (2 * np.pi)
     E = kepler_E(M, e)
     nu = true_anomaly(E, e)
@@ -73,213 +234,452 @@ def position_from_elements(a, e, i, T, t_seconds, M0=0.0, omega=0.0, Omega=0.0):
     x_orb = r * np.cos(nu)
     y_orb = r * np.sin(nu)
 
-    # Rotate from orbital plane to heliocentric ecliptic coordinates
-    x = (np.cos(Omega) * np.cos(omega) - np.sin(Omega) * np.sin(omega) * np.cos(i)) * x_orb + \
-        (-np.cos(Omega) * np.sin(omega) - np.sin(Omega) * np.cos(omega) * np.cos(i)) * y_orb
-    y = (np.sin(Omega) * np.cos(omega) + np.cos(Omega) * np.sin(omega) * np.cos(i)) * x_orb + \
-        (-np.sin(Omega) * np.sin(omega) + np.cos(Omega) * np.cos(omega) * np.cos(i)) * y_orb
-    z = (np.sin(omega) * np.sin(i)) * x_orb + (np.cos(omega) * np.sin(i)) * y_orb
+    # Rotate from orbital plane to heliocentric ecliptic coordinates with one
+    # contraction; the orbital-plane z is zero, so only two columns of P matter
+    P = orbit_rotation_matrix(i, omega, Omega)[..., :2]
+    return np.einsum('...ij,...j->...i', P, np.stack([x_orb, y_orb], axis=-1))
+
+
+def orbit_line(a, e, i, omega, Omega, n_points):
+    """Closed full-orbit line of `n_points` samples, shape (n_points, 3).
+
+    Sampled uniformly in eccentric anomaly rather than time, so eccentric
+    orbits keep a smooth perihelion with fewer points; no Kepler solve or
+    true-anomaly step is needed. Open orbits (e >= 1) have no closed line and
+    give nan samples, as the propagation does, rather than raising.
+    """
+    E = np.linspace(0.0, 2 * np.pi, n_points)
+    x_orb = a * (np.cos(E) - e)
+    y_orb = a * (math.sqrt(1 - e * e) if e < 1 else math.nan) * np.sin(E)
+    P = orbit_rotation_matrix(i, omega, Omega)[:, :2]
+    return np.stack([x_orb, y_orb], axis=-1) @ P.T
+
+
+def positions_many(a, e, i, T, t_seconds, M0=0.0, omega=0.0, Omega=0.0):
+    """Positions of several bodies sampled on one shared time grid.
+
+    Element arguments are length-B sequences (scalars are broadcast) and
+    `t_seconds` is a length-N array; returns an array of shape (B, N, 3).
+    With Numba the bodies are propagated one after another inside a single
+    serial kernel call (see _propagate_many_kernel for why not in parallel).
+    """
+    elems = np.broadcast_arrays(*(np.atleast_1d(np.asarray(x, dtype=np.float64))
+                                  for x in (a, e, i, T, M0, omega, Omega)))
+    a, e, i, T, M0, omega, Omega = (np.ascontiguousarray(x) for x in elems)
+    t = np.ascontiguousarray(t_seconds, dtype=np.float64)
+    if _have_numba:
+        out = np.empty((a.shape[0], 3, t.shape[0]))
+        _propagate_many_kernel(a, e, i, T, t, M0, omega, Omega, 1e-10, 10, out)
+        return out.transpose(0, 2, 1)
+    # one broadcast NumPy evaluation: (B, 1) elements against a (1, N) time grid
+    col = (lambda x: x[:, None])
+    return position_from_elements(col(a), col(e), col(i), col(T), t[None, :], col(M0), col(omega), col(Omega))
+
+
+def warm_up():
+    """Load plotly and compile (or load from Numba's cache) the orbit kernels.
+
+    Intended for server start-up (see wsgi.py) so the first visualisation
+    request does not pay the import/JIT cost. The asteroid-independent samples
+    for the default grid (time grid, Earth, planets) are cached here as well.
+    Only serial kernels run here, so it is safe in a master that forks workers
+    afterwards (gunicorn preload_app); no Numba thread pool is started.
+    """
+    try:
+        import plotly.graph_objs  # noqa: F401
+        import plotly.io  # noqa: F401
+    except Exception:
+        pass
+    t = np.zeros(2)
+    position_from_elements(AU, 0.1, 0.0, T_earth, t)
+    positions_many([AU], [0.1], [0.0], [T_earth], t)
+    _planet_max_radius_sq(max(360, DEFAULT_SAMPLES))
+    _time_grid_positions(DEFAULT_DAYS, DEFAULT_SAMPLES)
 
-    return np.array([x, y, z])
+
+def _max_radius_sq(positions):
+    """Largest squared heliocentric distance in an (N, 3) position array."""
+    if not len(positions):
+        return 0.0
+    return float(np.max(np.einsum('ij,ij->i', positions, positions)))
 
 
 # The visualiser is provided as a function so it can be called from Flask routes.
-def simulate_sun_earth_asteroid(neo=None, days=DEFAULT_DAYS, samples=90):
+def simulate_sun_earth_asteroid(neo=None, days=DEFAULT_DAYS, samples=DEFAULT_SAMPLES, max_frames=MAX_ANIMATION_FRAMES):
     """
     Generate an embeddable Plotly HTML fragment showing the Sun, Earth's orbit and
     a single asteroid orbit (from `neo` orbital_data) or a simple demo if `neo` is None.
+    `neo` may also be a list of NeoWs objects to show several asteroids together.
+    At most `max_frames` animation frames are emitted (see build_figure).
 
     Returns a string containing an HTML fragment (not a full page). The application
     template already includes the Plotly script, so this fragment omits the library.
+    The fragment depends only on the orbital elements and the time grid, so it is
+    cached on those and each call just substitutes a fresh plot div id.
     """
+    html = _graph_html_template(_asteroid_elements_many(neo), days, samples, max_frames)
+    return html.replace(_DIV_ID_PLACEHOLDER, f"orbit_plot_{next(_PLOT_UID)}")
 
-    # time grid
-    time_days = np.linspace(0, days, samples)
-    time_seconds = time_days * DT
 
+@lru_cache(maxsize=32)
+def _graph_html_template(asteroids, days, samples, max_frames=MAX_ANIMATION_FRAMES):
+    """Compute the orbits and render the HTML fragment with a placeholder div id.
+
+    Fragments are large (tens of KB each), so only a few are kept; the
+    visualise page also caches its fragment per asteroid id in app.py.
+    """
+    orbits = _orbit_from_elements(asteroids, days, samples)
     # Lazy-import plotly so the module can be imported even if plotly is not installed.
     try:
-        import plotly.graph_objs as go
-        import plotly.io as pio
-        _have_plotly = True
+        import plotly.graph_objs  # noqa: F401
+        import plotly.io  # noqa: F401
     except Exception:
-        go = None
-        pio = None
-        _have_plotly = False
+        # If Plotly is not available, return a small static SVG fragment as a fast fallback.
+        try:
+            return render_svg(orbits)
+        except Exception:
+            return '<p>Visualisation not available (Plotly not installed).</p>'
+    return render_html(build_figure(orbits, max_frames), div_id=_DIV_ID_PLACEHOLDER)
+
+
+def simulate_svg(neo=None, days=DEFAULT_DAYS, samples=DEFAULT_SAMPLES):
+    """Static top-down SVG fragment of the Sun and the planet, Earth and
+    asteroid orbits, for views that need no animation or 3D interaction.
+
+    A few KB of markup with no JavaScript, versus the Plotly fragment's
+    typed arrays and frames. `neo` is interpreted as for
+    simulate_sun_earth_asteroid, and the fragment is cached on the orbital
+    elements and the time grid.
+    """
+    return _svg_fragment(_asteroid_elements_many(neo), days, samples)
+
+
+@lru_cache(maxsize=32)
+def _svg_fragment(asteroids, days, samples):
+    """Compute the orbits and render them with render_svg."""
+    return render_svg(_orbit_from_elements(asteroids, days, samples))
+
+
+# Simple planetary semi-major axes and colours - relative distances.
+# Circular orbits (e=0) in the ecliptic, for visual context only.
+_PLANETS = (
+    ("Mercury", 0.387 * AU, "lightgray"),
+    ("Venus", 0.723 * AU, "goldenrod"),
+    ("Mars", 1.524 * AU, "orangered"),
+    # Jupiter brought 50% closer for visual purposes
+    ("Jupiter", 5.203 * AU * 0.5, "sandybrown"),
+)
+_A_PLANETS = np.array([a_p for (_pn, a_p, _pc) in _PLANETS])
+_T_PLANETS = 2 * np.pi * np.sqrt((_A_PLANETS ** 3) / mu_sun)
+# offset the mean anomaly per planet so markers start at different positions
+_M0_PLANETS = np.radians(360.0 * (np.arange(len(_PLANETS)) / len(_PLANETS)))
+
+
+@lru_cache(maxsize=4)
+def _planet_orbit_lines(orbit_samples):
+    """Full-orbit lines of all planets, shape (P, orbit_samples, 3), read-only.
+
+    Sampled densely over one orbital period so each orbit shows completely;
+    with the time grid expressed in periods (T = 1) all planets share it and
+    go through the batch kernel in one call.
+    """
+    lines = positions_many(_A_PLANETS, 0.0, 0.0, 1.0, np.linspace(0.0, 1.0, orbit_samples), _M0_PLANETS)
+    lines.flags.writeable = False
+    return lines
+
+
+@lru_cache(maxsize=4)
+def _planet_max_radius_sq(orbit_samples):
+    """Largest squared radius over all cached planet orbit lines."""
+    lines = _planet_orbit_lines(orbit_samples)
+    return _max_radius_sq(lines.reshape(-1, 3))
 
-    # Earth positions
+
+@lru_cache(maxsize=4)
+def _time_grid_positions(days, samples):
+    """Time grid (days, seconds), Earth positions (N, 3) and planet
+    positions (P, N, 3) for one animation grid, all read-only.
+
+    None of these depend on the asteroid, so each grid is propagated once.
+    """
+    time_days = np.linspace(0, days, samples)
+    time_seconds = time_days * DT
     M0_earth = 0.0
-    earth_positions = np.array([
-        position_from_elements(a_earth, e_earth, i_earth, T_earth, t, M0_earth)
-        for t in time_seconds
-    ])
-
-    # Simple planetary semi-major axes (AU) and colours - relative distances
-    # We'll compute circular-ish orbits (e=0) in the ecliptic for visual context
-    planets_info = [
-        ("Mercury", 0.387 * AU, "lightgray"),
-        ("Venus", 0.723 * AU, "goldenrod"),
-        ("Mars", 1.524 * AU, "orangered"),
-        # Jupiter brought 50% closer for visual purposes
-        ("Jupiter", 5.203 * AU * 0.5, "sandybrown"),
-    ]
+    # Earth and all planets as one (1 + P, N, 3) batch on the main time grid
+    # (a handful of bodies, propagated serially in one kernel call)
+    bodies = positions_many(
+        np.r_[a_earth, _A_PLANETS], np.r_[e_earth, np.zeros(len(_PLANETS))],
+        np.r_[i_earth, np.zeros(len(_PLANETS))], np.r_[T_earth, _T_PLANETS],
+        time_seconds, np.r_[M0_earth, _M0_PLANETS],
+    )
+    earth_positions, planets_anim = bodies[0], bodies[1:]
+    arrays = (time_days, time_seconds, earth_positions, planets_anim)
+    for arr in arrays:
+        arr.flags.writeable = False
+    return arrays
 
-    planet_sets = []
-    for idx, (pname, a_p, pcolor) in enumerate(planets_info):
-        # circular orbit approximation for visualisation
-        T_p = 2 * np.pi * np.sqrt((a_p ** 3) / mu_sun)
-        # offset the mean anomaly slightly per planet so markers start at different positions
-        M0_p = np.radians(360.0 * (idx / max(1, len(planets_info))))
-        # animation positions sampled on the main time grid
-        pos_p_anim = np.array([position_from_elements(a_p, 0.0, 0.0, T_p, t, M0_p) for t in time_seconds])
-        # full-orbit line sampled densely over one orbital period so the orbit shows completely
-        orbit_samples = max(360, samples)
-        t_full = np.linspace(0, T_p, orbit_samples)
-        pos_p_full = np.array([position_from_elements(a_p, 0.0, 0.0, T_p, t, M0_p) for t in t_full])
-        planet_sets.append((pos_p_anim, pos_p_full, pcolor, pname))
-
-    # Parse a single asteroid from neo if provided, otherwise a small demo
-    asteroid_sets = []
+
+def _asteroid_elements(neo):
+    """Orbital elements of `neo` as a hashable tuple
+    `(a, e, i, omega, Omega, T, M0, label, color)` (SI units, radians),
+    or the built-in demo asteroid when `neo` is missing or unparsable.
+    """
     if neo and isinstance(neo, dict):
         od = neo.get('orbital_data', {})
         try:
             a = float(od.get('semi_major_axis') or od.get('a') or od.get('a_au')) * AU
             e = float(od.get('eccentricity') or od.get('e'))
-            i = np.radians(float(od.get('inclination') or od.get('i') or 0.0))
-            omega = np.radians(float(
+            if not 0.0 <= e < 1.0:
+                # only closed orbits can be propagated and drawn
+                raise ValueError(f"unsupported eccentricity {e}")
+            i = math.radians(float(od.get('inclination') or od.get('i') or 0.0))
+            omega = math.radians(float(
                 od.get('perihelion_argument')
                 or od.get('perihelion_argument_deg')
                 or od.get('perihelion_arg')
                 or od.get('pericenter_argument')
                 or 0.0
             ))
-            Omega = np.radians(float(od.get('ascending_node_longitude') or od.get('node_longitude') or 0.0))
+            Omega = math.radians(float(od.get('ascending_node_longitude') or od.get('node_longitude') or 0.0))
             T_ast_days = float(od.get('orbital_period') or od.get('period') or od.get('period_yr', 0.0))
             if T_ast_days and T_ast_days < 1e5:
                 T_ast = T_ast_days * 86400.0
             else:
                 # fallback: compute period from semi-major axis using Kepler's third law
-                T_ast = 2 * np.pi * np.sqrt((a**3) / mu_sun)
-            M0 = np.radians(float(od.get('mean_anomaly') or od.get('M') or 0.0))
+                T_ast = 2 * math.pi * math.sqrt((a**3) / mu_sun)
+            M0 = math.radians(float(od.get('mean_anomaly') or od.get('M') or 0.0))
             label = neo.get('name') or neo.get('designation') or 'Asteroid'
-            color = 'crimson'
+            return (a, e, i, omega, Omega, T_ast, M0, label, 'crimson')
         except Exception:
             # fallback to demo below
-            neo = None
-
-    if not neo:
-        # small demo asteroid (a few elements) — visible and visually pleasing
-        label = 'Demo Asteroid'
-        color = 'magenta'
-        a = 1.3 * AU
-        e = 0.35
-        i = np.radians(12.0)
-        T_ast = 2 * np.pi * np.sqrt((a**3) / mu_sun)
-    pos_anim = np.array([
-        position_from_elements(a, e, i, T_ast, t, M0, omega, Omega)
-        for t in time_seconds
-    ])
-    # sample full asteroid orbit densely so the complete orbit line is visible
-    orbit_samples_ast = max(360, samples)
-    t_full_ast = np.linspace(0, T_ast, orbit_samples_ast)
-    pos_full = np.array([
-        position_from_elements(a, e, i, T_ast, t, M0, omega, Omega) for t in t_full_ast
-    ])
-    asteroid_sets.append((pos_anim, pos_full, color, label))
-
-    # If Plotly is not available, return a small static SVG fragment as a fast fallback.
-    if not _have_plotly:
-        try:
-            # build a simple 2D projection (x,y) SVG
-            w, h = 700, 420
-            # compute a view radius from available samples
-            try:
-                max_planet_radius = max(
-                    np.max(np.linalg.norm(ps_full, axis=1))
-                    for (_pa, ps_full, _pc, _pn) in planet_sets
-                )
-            except Exception:
-                max_planet_radius = 3.0 * AU
-            try:
-                asteroid_radii = [
-                    np.max(np.linalg.norm(ast_full, axis=1))
-                    for (ast_anim, ast_full, _ac, _al) in asteroid_sets
-                ]
-                max_asteroid_radius = max(asteroid_radii) if asteroid_radii else 0.0
-            except Exception:
-                max_asteroid_radius = 0.0
-            try:
-                earth_radius = (
-                    float(np.max(np.linalg.norm(earth_positions, axis=1)))
-                    if earth_positions.size else 1.0 * AU
-                )
-            except Exception:
-                earth_radius = 1.0 * AU
-            view_r = float(max(max_planet_radius, max_asteroid_radius, earth_radius, 3.0 * AU) * 1.08)
-
-            def to_px(x, y):
-                sx = (x / (view_r * 2) + 0.5) * w
-                sy = (1 - (y / (view_r * 2) + 0.5)) * h
-                return sx, sy
-
-            svg_parts = [f'<svg width="{w}" height="{h}" viewBox="0 0 {w} {h}" '
-                         'style="background:transparent">']
-            # sun
-            sx, sy = to_px(0, 0)
-            svg_parts.append(f'<circle cx="{sx:.1f}" cy="{sy:.1f}" r="8" fill="yellow" />')
-            # earth orbit
-            earth_pts = ['{:.1f},{:.1f}'.format(*to_px(x, y)) for (x, y, z) in earth_positions]
-            svg_parts.append(f'<polyline points="{" ".join(earth_pts)}" '
-                             'stroke="royalblue" fill="none" stroke-width="1" />')
-            # asteroid orbit (first one)
-            for (pos_anim, pos_full, color, label) in asteroid_sets:
-                ast_pts = ['{:.1f},{:.1f}'.format(*to_px(x, y)) for (x, y, z) in pos_full]
-                svg_parts.append(f'<polyline points="{" ".join(ast_pts)}" '
-                                 f'stroke="{color}" fill="none" stroke-width="1.5" />')
-            svg_parts.append('</svg>')
-            return '\n'.join(svg_parts)
-        except Exception:
-            return '<p>Visualisation not available (Plotly not installed).</p>'
+            pass
 
-    # Create plotly figure (single scene, interactive) with animation frames and a slider
-    # Compute an axis range that fits the outermost orbit (planets or asteroid)
-    # so the largest orbit (e.g., Jupiter) appears near the edge while keeping
-    # Earth, other planets and the asteroid comfortably visible.
-    # derive radii from full-orbit samples
-    try:
-        max_planet_radius = max(np.max(np.linalg.norm(ps_full, axis=1)) for (_pa, ps_full, _pc, _pn) in planet_sets)
-    except Exception:
-        max_planet_radius = 3.0 * AU
+    # small demo asteroid (a few elements) — visible and visually pleasing
+    a = 1.3 * AU
+    return (a, 0.35, math.radians(12.0), 0.0, 0.0, 2 * math.pi * math.sqrt((a**3) / mu_sun), 0.0,
+            'Demo Asteroid', 'magenta')
 
-    try:
-        # compute max radius per asteroid full-orbit sample and take the maximum
-        asteroid_radii = [np.max(np.linalg.norm(ast_full, axis=1))
-                          for (ast_anim, ast_full, _ac, _al) in asteroid_sets]
-        max_asteroid_radius = max(asteroid_radii) if asteroid_radii else 0.0
-    except Exception:
-        max_asteroid_radius = 0.0
 
-    earth_radius = float(np.max(np.linalg.norm(earth_positions, axis=1))) if earth_positions.size else 1.0 * AU
+def _asteroid_elements_many(neos):
+    """`_asteroid_elements` for one NeoWs object or a list of them, as a tuple."""
+    if isinstance(neos, (list, tuple)) and neos:
+        return tuple(_asteroid_elements(neo) for neo in neos)
+    return (_asteroid_elements(neos),)
+
 
+def build_orbit(neo=None, days=DEFAULT_DAYS, samples=DEFAULT_SAMPLES):
+    """Sample the Earth, planet and asteroid orbits for one figure.
+
+    `neo` is one NeoWs object, a list of them, or None for the demo asteroid.
+    Returns a dict with the time grid, the Earth positions, the planet and
+    asteroid `(pos_anim, pos_full, color, label)` sets and the view radius.
+    Pure numerics: no plotting library is needed.
+    """
+    return _orbit_from_elements(_asteroid_elements_many(neo), days, samples)
+
+
+def _orbit_from_elements(asteroids, days, samples):
+    """`build_orbit` for a tuple of `_asteroid_elements` tuples."""
+    # time grid, Earth and planet positions depend only on the grid (cached);
+    # the full-orbit lines are constant and come from the module-level cache
+    time_days, time_seconds, earth_positions, planets_anim = _time_grid_positions(days, samples)
+    orbit_samples = max(360, samples)
+    planets_full = _planet_orbit_lines(orbit_samples)
+
+    planet_sets = []
+    for idx, (pname, _a_p, pcolor) in enumerate(_PLANETS):
+        planet_sets.append((planets_anim[idx], planets_full[idx], pcolor, pname))
+
+    # asteroid elements as columns (structure of arrays); the usual single
+    # asteroid takes the serial single-body path, lists go through one batch call
+    a, e, i, omega, Omega, T_ast, M0 = np.array([el[:7] for el in asteroids], dtype=np.float64).T
+    if len(asteroids) == 1:
+        asteroids_anim = position_from_elements(a[0], e[0], i[0], T_ast[0], time_seconds,
+                                                M0[0], omega[0], Omega[0])[None]
+    else:
+        asteroids_anim = positions_many(a, e, i, T_ast, time_seconds, M0, omega, Omega)
+    asteroid_sets = []
+    for j, (*_elems, label, color) in enumerate(asteroids):
+        # the full-orbit line is sampled in eccentric anomaly, which spreads points
+        # evenly around the ellipse, so half the planets' sample count suffices
+        pos_full = orbit_line(a[j], e[j], i[j], omega[j], Omega[j], max(180, samples))
+        asteroid_sets.append((asteroids_anim[j], pos_full, color, label))
+
+    # Compute a view radius that fits the outermost orbit (planets or asteroid)
+    # so the largest orbit (e.g., Jupiter) appears near the edge while keeping
+    # Earth, other planets and the asteroid comfortably visible. Radii come from
+    # the full-orbit samples; squared distances are compared so only the final
+    # maximum needs a square root. The planet lines are fixed, so their
+    # maximum is cached; Earth and the asteroid orbits take one reduction.
+    max_r2 = max(
+        _planet_max_radius_sq(orbit_samples),
+        _max_radius_sq(np.concatenate([earth_positions] + [ast_full for (_aa, ast_full, _ac, _al) in asteroid_sets])),
+    )
     # take the largest radius and add a small padding
-    max_radius = max(max_planet_radius, max_asteroid_radius, earth_radius, 3.0 * AU)
-    axis_range = float(max_radius * 1.08)
+    view_r = float(max(math.sqrt(max_r2), 3.0 * AU) * 1.08)
+
+    return dict(
+        time_days=time_days,
+        time_seconds=time_seconds,
+        earth_positions=earth_positions,
+        planet_sets=planet_sets,
+        asteroid_sets=asteroid_sets,
+        view_r=view_r,
+    )
+
+
+_SVG_WIDTH, _SVG_HEIGHT = 700, 420
+_SVG_TEMPLATE = (
+    '<svg width="{w}" height="{h}" viewBox="0 0 {w} {h}" style="background:transparent">\n'
+    '{planets}'
+    '<path d="{earth}" stroke="royalblue" fill="none" stroke-width="1" />\n'
+    '{asteroids}'
+    '<circle cx="{sx:.1f}" cy="{sy:.1f}" r="8" fill="yellow" />\n'
+    '{markers}'
+    '</svg>'
+)
+_SVG_PLANET = '<path d="{d}" stroke="{color}" fill="none" stroke-width="0.5" opacity="0.6" />\n'
+_SVG_ASTEROID = '<path d="{d}" stroke="{color}" fill="none" stroke-width="1.5" />\n'
+_SVG_MARKER = '<circle cx="{:.1f}" cy="{:.1f}" r="{}" fill="{}" />\n'
+
+
+def render_svg(orbits):
+    """Render `build_orbit` output as a static top-down SVG fragment: one
+    `<path>` per planet, Earth and asteroid orbit, plus `<circle>` markers
+    for the Sun and the bodies' positions at the start of the time grid.
+    """
+    view_r = orbits['view_r']
+    w, h = _SVG_WIDTH, _SVG_HEIGHT
+
+    # build a simple 2D projection (x,y) SVG
+    def to_px(x, y):
+        sx = (x / (view_r * 2) + 0.5) * w
+        sy = (1 - (y / (view_r * 2) + 0.5)) * h
+        return sx, sy
+
+    def path(positions):
+        # project all samples at once, then format the pixel pairs in one join
+        sx, sy = to_px(positions[:, 0], positions[:, 1])
+        sx, sy = sx.tolist(), sy.tolist()
+        return f"M {sx[0]:.1f} {sy[0]:.1f} " + ' '.join(map('L {:.1f} {:.1f}'.format, sx[1:], sy[1:]))
+
+    def marker(positions, r, color):
+        return _SVG_MARKER.format(*to_px(positions[0, 0], positions[0, 1]), r, color)
+
+    earth_positions = orbits['earth_positions']
+    bodies = orbits['planet_sets'] + orbits['asteroid_sets']
+    sx, sy = to_px(0, 0)  # sun
+    return _SVG_TEMPLATE.format(
+        w=w, h=h, sx=sx, sy=sy,
+        planets=''.join(_SVG_PLANET.format(d=path(pos_full), color=color)
+                        for (_pa, pos_full, color, _label) in orbits['planet_sets']),
+        earth=path(earth_positions),
+        asteroids=''.join(_SVG_ASTEROID.format(d=path(pos_full), color=color)
+                          for (_pa, pos_full, color, _label) in orbits['asteroid_sets']),
+        markers=marker(earth_positions, 4, 'royalblue') + ''.join(
+            marker(pos_anim, 3, color) for (pos_anim, _pf, color, _label) in bodies),
+    )
+
+
+def _plot_xyz(positions):
+    """Split an (N, 3) position array into contiguous float32 x, y, z rows.
+
+    Orbits are computed in float64; Plotly only needs pixel precision, and
+    float32 halves the size of the typed arrays embedded in the page.
+    """
+    return np.asarray(positions.T, dtype=np.float32)
+
+
+def _plot_points(positions):
+    """(N, 3) positions as nested lists of float32-rounded Python floats.
+
+    Used for the single-point marker updates in frames, where typed arrays
+    would be larger than the plain numbers.
+    """
+    return np.asarray(positions, dtype=np.float32).tolist()
+
+
+@lru_cache(maxsize=1)
+def _base_layout():
+    """The parts of the figure layout shared by every figure, validated once.
+
+    `go.Figure(layout=...)` copies it, so figures never modify the cached object.
+    """
+    import plotly.graph_objs as go
 
     hidden_axis = dict(
-        range=[-axis_range, axis_range], showbackground=False, showgrid=False,
+        showbackground=False, showgrid=False,
         showticklabels=False, zeroline=False, color='white', title={'text': ''}
     )
+    return go.Layout(
+        scene=dict(
+            xaxis=hidden_axis, yaxis=hidden_axis, zaxis=hidden_axis,
+            aspectmode='manual', aspectratio=dict(x=1, y=1, z=0.4),
+            # set a stable, normalized camera view so "zoom" and angle are
+            # controlled consistently regardless of absolute data units.
+            # These normalized eye values place Jupiter's orbit near the frame
+            # edge while keeping inner planets and the asteroid visible.
+            camera=dict(
+                eye=dict(x=0.5, y=0.5, z=0.3),
+                center=dict(x=0, y=0, z=0),
+                up=dict(x=0, y=0, z=1),
+                projection=dict(type='perspective')
+            )
+        ),
+        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
+        # add right margin to leave room for the info sidebar
+        margin=dict(l=0, r=380, t=30, b=0),
+        height=720,
+        showlegend=True,
+        # legend acts as the key for traces (orbits and Sun)
+        legend=dict(
+            orientation='v',
+            x=0.02, y=0.98,
+            xanchor='left', yanchor='top',
+            bgcolor='rgba(0,0,0,0)',
+            bordercolor='rgba(0,0,0,0.2)'
+        ),
+    )
+
+
+@lru_cache(maxsize=4)
+def _static_traces(orbit_samples):
+    """Sun marker and planet full-orbit line traces (identical in every figure)."""
+    import plotly.graph_objs as go
+
+    sun = go.Scatter3d(x=[0], y=[0], z=[0], mode='markers',
+                       marker=dict(size=18, color='yellow'), name='Sun', showlegend=True)
+    orbits = []
+    for (pname, _a_p, pcolor), line in zip(_PLANETS, _planet_orbit_lines(orbit_samples)):
+        px_line, py_line, pz_line = _plot_xyz(line)
+        orbits.append(go.Scatter3d(x=px_line, y=py_line, z=pz_line, mode='lines',
+                                   line=dict(color=pcolor, width=1), name=f'{pname} Orbit', showlegend=True))
+    return sun, tuple(orbits)
+
+
+def build_figure(orbits, max_frames=MAX_ANIMATION_FRAMES):
+    """Build the animated Plotly figure for `build_orbit` output.
+
+    The time grid is strided so the figure has at most `max_frames` frames.
+    """
+    import plotly.graph_objs as go
+
+    time_days = orbits['time_days']
+    time_seconds = orbits['time_seconds']
+    earth_positions = orbits['earth_positions']
+    planet_sets = orbits['planet_sets']
+    asteroid_sets = orbits['asteroid_sets']
+
+    # Create plotly figure (single scene, interactive) with animation frames and a slider
+    axis_range = orbits['view_r']
 
-    fig = go.Figure()
+    # the layout and traces that never change are built and validated once
+    fig = go.Figure(layout=_base_layout())
 
     # Background stars (placed first so they act as a subtle backdrop around planets)
     try:
-        # fewer stars -> less initial payload
-        stars_count = 120
-        rng = np.random.default_rng(42)
-        xs = rng.uniform(-axis_range * 0.95, axis_range * 0.95, stars_count)
-        ys = rng.uniform(-axis_range * 0.95, axis_range * 0.95, stars_count)
-        zs = rng.uniform(-axis_range * 0.95, axis_range * 0.95, stars_count)
+        # unit star field is generated once at import; only the scale changes
+        xs, ys, zs = (_STAR_FIELD * axis_range).astype(np.float32)
         fig.add_trace(go.Scatter3d(
             x=xs, y=ys, z=zs,
             mode='markers',
@@ -291,130 +691,90 @@ def simulate_sun_earth_asteroid(neo=None, days=DEFAULT_DAYS, samples=90):
 
     # Static traces: Sun marker, Earth full orbit, Asteroid full orbit
     # Sun (legend enabled)
-    fig.add_trace(go.Scatter3d(x=[0], y=[0], z=[0], mode='markers',
-                               marker=dict(size=18, color='yellow'), name='Sun', showlegend=True))
+    sun_trace, planet_orbit_traces = _static_traces(len(planet_sets[0][1]))
+    fig.add_trace(sun_trace)
 
     # Earth full orbit (legend enabled)
-    fig.add_trace(go.Scatter3d(x=earth_positions[:, 0], y=earth_positions[:, 1], z=earth_positions[:, 2],
+    ex_line, ey_line, ez_line = _plot_xyz(earth_positions)
+    fig.add_trace(go.Scatter3d(x=ex_line, y=ey_line, z=ez_line,
                                mode='lines', line=dict(color='royalblue', width=2),
                                name='Earth Orbit', showlegend=True))
 
+    # Frames are capped at max_frames; only the kept time steps are
+    # ever shown, so the moving markers are sampled at those steps only.
+    n_steps = len(time_seconds)
+    frame_stride = max(1, -(-n_steps // max(1, max_frames)))
+    frame_indices = range(0, n_steps, frame_stride)
+    # Marker coordinates per moving body (Earth, planets, asteroids, in trace
+    # order) as float32 values turned into Python lists once: shorter numbers
+    # in the frame JSON and no per-frame numpy scalar handling.
+    movers = [earth_positions] + [ps[0] for ps in planet_sets] + [ast[0] for ast in asteroid_sets]
+    marker_points = [_plot_points(pos[::frame_stride]) for pos in movers]
+
     # Earth marker (moving) - do not duplicate legend entry
     # We'll track dynamic trace indices so frames only update these traces.
     dynamic_traces = []
-    fig.add_trace(go.Scatter3d(x=[earth_positions[0, 0]], y=[earth_positions[0, 1]], z=[earth_positions[0, 2]],
+    ex, ey, ez = marker_points[0][0]
+    fig.add_trace(go.Scatter3d(x=[ex], y=[ey], z=[ez],
                                mode='markers', marker=dict(size=6, color='blue'), name='Earth', showlegend=False))
     dynamic_traces.append(len(fig.data) - 1)
-
-    # Earth trail (will be updated in frames)
-    fig.add_trace(go.Scatter3d(x=[], y=[], z=[], mode='lines', line=dict(color='royalblue', width=2),
-                               name='Earth Trail', showlegend=False))
-    dynamic_traces.append(len(fig.data) - 1)
+    # No trail traces: they would retrace the static full-orbit lines in the
+    # same colour and width, so frames only move the markers.
 
     # Planet orbits and markers (Mercury..Jupiter)
-    for (pos_p_anim, pos_p_full, pcolor, pname) in planet_sets:
+    for (_pa, _pf, pcolor, pname), orbit_trace, points in zip(planet_sets, planet_orbit_traces, marker_points[1:]):
         # full orbit line (legend entry) - static
-        fig.add_trace(go.Scatter3d(x=pos_p_full[:, 0], y=pos_p_full[:, 1], z=pos_p_full[:, 2], mode='lines',
-                                   line=dict(color=pcolor, width=1), name=f'{pname} Orbit', showlegend=True))
+        fig.add_trace(orbit_trace)
         # planet marker (moving)
-        fig.add_trace(go.Scatter3d(x=[pos_p_anim[0, 0]], y=[pos_p_anim[0, 1]], z=[pos_p_anim[0, 2]], mode='markers',
+        px, py, pz = points[0]
+        fig.add_trace(go.Scatter3d(x=[px], y=[py], z=[pz], mode='markers',
                                    marker=dict(size=4, color=pcolor), name=pname, showlegend=False))
         dynamic_traces.append(len(fig.data) - 1)
-        # trail for planet
-        fig.add_trace(go.Scatter3d(x=[], y=[], z=[], mode='lines', line=dict(color=pcolor, width=1),
-                                   name=f'{pname} Trail', showlegend=False))
-        dynamic_traces.append(len(fig.data) - 1)
-
-    # (Background stars are added earlier as a backdrop; no additional stars here)
 
     # Asteroid full orbit
-    for (pos_anim, pos_full, color, label) in asteroid_sets:
+    for (_aa, pos_full, color, label), points in zip(asteroid_sets, marker_points[1 + len(planet_sets):]):
         # full asteroid orbit (legend entry)
-        fig.add_trace(go.Scatter3d(x=pos_full[:, 0], y=pos_full[:, 1], z=pos_full[:, 2], mode='lines',
+        ax_line, ay_line, az_line = _plot_xyz(pos_full)
+        fig.add_trace(go.Scatter3d(x=ax_line, y=ay_line, z=az_line, mode='lines',
                                    line=dict(color=color, width=2), name=f'{label} Orbit', showlegend=True))
 
         # Asteroid marker (moving)
-        fig.add_trace(go.Scatter3d(x=[pos_anim[0, 0]], y=[pos_anim[0, 1]], z=[pos_anim[0, 2]], mode='markers',
+        ax, ay, az = points[0]
+        fig.add_trace(go.Scatter3d(x=[ax], y=[ay], z=[az], mode='markers',
                                    marker=dict(size=5, color=color), name=label, showlegend=False))
         dynamic_traces.append(len(fig.data) - 1)
 
-        # Asteroid trail (updated per frame)
-        fig.add_trace(go.Scatter3d(x=[], y=[], z=[], mode='lines', line=dict(color=color, width=2),
-                                   name=f'{label} Trail', showlegend=False))
-        dynamic_traces.append(len(fig.data) - 1)
-
-    # Build frames
     # Build frames but only update the dynamic traces to keep frame payload small.
-    frames = []
-    n_steps = len(time_seconds)
-    for k in range(n_steps):
-        frame_data = []
-        # Earth marker (moving)
-        ex, ey, ez = earth_positions[k]
-        frame_data.append(dict(type='scatter3d', x=[ex], y=[ey], z=[ez]))
-
-        # Earth trail (up to k)
-        frame_data.append(dict(type='scatter3d', x=earth_positions[:k+1, 0].tolist(),
-                               y=earth_positions[:k+1, 1].tolist(), z=earth_positions[:k+1, 2].tolist()))
-
-        # Planet markers and trails
-        for (pos_p_anim, pos_p_full, pcolor, pname) in planet_sets:
-            px, py, pz = pos_p_anim[k]
-            frame_data.append(dict(type='scatter3d', x=[px], y=[py], z=[pz]))
-            frame_data.append(dict(type='scatter3d', x=pos_p_anim[:k+1, 0].tolist(),
-                                   y=pos_p_anim[:k+1, 1].tolist(), z=pos_p_anim[:k+1, 2].tolist()))
-
-        # Asteroid marker and trail
-        for (pos_anim, pos_full, color, label) in asteroid_sets:
-            ax, ay, az = pos_anim[k]
-            frame_data.append(dict(type='scatter3d', x=[ax], y=[ay], z=[az]))
-            frame_data.append(dict(type='scatter3d', x=pos_anim[:k+1, 0].tolist(),
-                                   y=pos_anim[:k+1, 1].tolist(), z=pos_anim[:k+1, 2].tolist()))
-
-        # Create frame updating only the dynamic traces (trace indices collected earlier)
-        frames.append(go.Frame(data=frame_data, name=str(k), traces=dynamic_traces))
+    # frame names, shared by the frames and the slider steps that target them
+    frame_names = {k: str(k) for k in frame_indices}
+    # zip(*marker_points) yields, per frame, one point per moving body in
+    # dynamic trace order; the trace index list is shared by every frame.
+    # Kept as plain dicts: assigning fig.frames validates them once, whereas
+    # go.Frame objects here would be validated and then deep-copied again.
+    # Dict literals, as this is the innermost loop of the figure build.
+    frames = [
+        {'data': [{'type': 'scatter3d', 'x': [x], 'y': [y], 'z': [z]} for (x, y, z) in step],
+         'name': frame_names[k], 'traces': dynamic_traces}
+        for k, step in zip(frame_indices, zip(*marker_points))
+    ]
 
     # Slider steps
     slider_steps = []
-    date_labels = [orbit_determination_date + timedelta(days=int(d)) for d in time_days]
-    for k in range(len(time_seconds)):
-        label_text = date_labels[k].strftime('%b %d')
+    for k in frame_indices:
+        label_text = (orbit_determination_date + timedelta(days=int(time_days[k]))).strftime('%b %d')
         slider_steps.append(dict(
             method='animate',
-            args=[[str(k)], dict(mode='immediate', frame=dict(duration=0, redraw=True), transition=dict(duration=0))],
+            args=[[frame_names[k]], _SLIDER_STEP_ARGS],
             label=label_text
         ))
 
-    # Layout with play/pause and slider
+    # Per-figure layout: axis ranges, title, play speed and slider (the rest is in _base_layout)
+    labels = [label for (_aa, _af, _ac, label) in asteroid_sets]
+    title_name = labels[0] if len(labels) == 1 else f"{len(labels)} asteroids"
+    axis = dict(range=[-axis_range, axis_range])
     fig.update_layout(
-        scene=dict(
-            xaxis=hidden_axis, yaxis=hidden_axis, zaxis=hidden_axis,
-            aspectmode='manual', aspectratio=dict(x=1, y=1, z=0.4),
-            # set a stable, normalized camera view so "zoom" and angle are
-            # controlled consistently regardless of absolute data units.
-            # These normalized eye values place Jupiter's orbit near the frame
-            # edge while keeping inner planets and the asteroid visible.
-            camera=dict(
-                eye=dict(x=0.5, y=0.5, z=0.3),
-                center=dict(x=0, y=0, z=0),
-                up=dict(x=0, y=0, z=1),
-                projection=dict(type='perspective')
-            )
-        ),
-        paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
-        # add right margin to leave room for the info sidebar
-        margin=dict(l=0, r=380, t=30, b=0),
-        height=720,
-        title=f"Sun – Earth – {label}",
-        showlegend=True,
-        # legend acts as the key for traces (orbits and Sun)
-        legend=dict(
-            orientation='v',
-            x=0.02, y=0.98,
-            xanchor='left', yanchor='top',
-            bgcolor='rgba(0,0,0,0)',
-            bordercolor='rgba(0,0,0,0.2)'
-        ),
+        scene=dict(xaxis=axis, yaxis=axis, zaxis=axis),
+        title=f"Sun – Earth – {title_name}",
         updatemenus=[
             dict(
                 type='buttons',
@@ -425,7 +785,7 @@ def simulate_sun_earth_asteroid(neo=None, days=DEFAULT_DAYS, samples=90):
                 buttons=[
                     dict(
                         label='Play', method='animate',
-                        args=[None, {"frame": {"duration": 80, "redraw": True},
+                        args=[None, {"frame": {"duration": 80 * frame_stride, "redraw": True},
                                      "fromcurrent": True, "transition": {"duration": 0}}]
                     ),
                     dict(
@@ -449,12 +809,11 @@ def simulate_sun_earth_asteroid(neo=None, days=DEFAULT_DAYS, samples=90):
     )
 
     fig.frames = frames
+    return fig
 
-    # Return an HTML fragment without including the Plotly.js script (template already has it)
-    html_fragment = pio.to_html(fig, include_plotlyjs=False, full_html=False)
 
-    # Ensure the animation is paused on load: append a small script that cancels any autoplay
-    stop_script = '''
+# Appended to every fragment: cancels any autoplay once the plot has loaded.
+_STOP_ANIMATION_SCRIPT = '''
 <script>
   (function(){
     function stopAnimation(){
@@ -467,10 +826,26 @@ def simulate_sun_earth_asteroid(neo=None, days=DEFAULT_DAYS, samples=90):
   })();
 </script>
 '''
-    html_fragment += stop_script
+
+
+def render_html(fig, div_id=None):
+    """Serialise a figure from `build_figure` to an embeddable HTML fragment.
+
+    A unique `orbit_plot_<n>` div id is generated unless `div_id` is given.
+    """
+    import plotly.io as pio
+
+    # Return an HTML fragment without including the Plotly.js script (template already has it).
+    # The traces were validated as they were added, so skip the second schema pass;
+    # plotly's "auto" JSON engine serialises with orjson when it is installed.
+    html_fragment = pio.to_html(fig, include_plotlyjs=False, include_mathjax=False,
+                                full_html=False, validate=False, div_id=div_id or f"orbit_plot_{next(_PLOT_UID)}")
+
+    # Ensure the animation is paused on load (see _STOP_ANIMATION_SCRIPT)
+    html_fragment += _STOP_ANIMATION_SCRIPT
     return html_fragment
 
 
-# End of file: this module exposes simulate_sun_earth_asteroid
+# End of file: this module exposes simulate_sun_earth_asteroid and simulate_svg
 
 
@@ -4,20 +4,36 @@ The NeoWs (Near Earth Object Web Service) API provides access to current and his
 
 import os
 import json
-import copy
+import time
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+import numpy as np
+from collections import OrderedDict
 from typing import Any, Dict, List
 
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json module
+    orjson = None
+
 # constants
 api_feed_url = "https://api.nasa.gov/neo/rest/v1/feed"
 api_lookup_url_template = "https://api.nasa.gov/neo/rest/v1/neo/{id}"
 default_api_key = os.environ.get("NASA_API_KEY", "DEMO_KEY")  # SET ENV VAR NASA_API_KEY if you have one
 request_timeout = 10  # seconds
 
+# shared keep-alive session so repeated lookups reuse pooled TLS connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+
+
 def _request_json(url: str, params: Dict[str, Any]) -> Dict[str, Any]:
     """http get and return parsed json"""
-    r = requests.get(url, params=params, timeout=request_timeout)
+    r = _SESSION.get(url, params=params, timeout=request_timeout)
     r.raise_for_status()
+    if orjson is not None:
+        return orjson.loads(r.content)
     return r.json()
 
 
@@ -27,40 +43,67 @@ def _neo_feed(start_date: str, end_date: str) -> Dict[str, Any]:
     return _request_json(api_feed_url, params)
 
 
+# Short-lived cache of lookup records, shared by the feed and the visualise/map
+# pages. Entries expire so close_approach_data does not go stale in a
+# long-running server. Keys are asteroid ids, values are (fetched_at, record).
+_LOOKUP_CACHE = OrderedDict()
+_LOOKUP_CACHE_MAX = 4096
+_LOOKUP_CACHE_TTL = 3600  # seconds
+_lookup_lock = threading.Lock()  # guards _LOOKUP_CACHE across request threads
+
+
 def _neo_lookup(asteroid_id: str) -> Dict[str, Any]:
-    """lookup detailed asteroid record by id (no caching)"""
-    url = api_lookup_url_template.format(id=asteroid_id)
-    return _request_json(url, {"api_key": default_api_key})
+    """lookup detailed asteroid record by id (cached while fresh; callers must not mutate the result)"""
+    key = str(asteroid_id)
+    now = time.monotonic()
+    with _lookup_lock:
+        hit = _LOOKUP_CACHE.get(key)
+        if hit is not None and now - hit[0] < _LOOKUP_CACHE_TTL:
+            _LOOKUP_CACHE.move_to_end(key)
+            return hit[1]
+    # fetched outside the lock so one slow lookup does not block the others
+    url = api_lookup_url_template.format(id=key)
+    record = _request_json(url, {"api_key": default_api_key})
+    with _lookup_lock:
+        _LOOKUP_CACHE[key] = (now, record)
+        _LOOKUP_CACHE.move_to_end(key)
+        if len(_LOOKUP_CACHE) > _LOOKUP_CACHE_MAX:
+            _LOOKUP_CACHE.popitem(last=False)
+    return record
+
+
+def _km_or_nan(approach: Dict[str, Any]) -> float:
+    """miss distance in kilometers of one approach, nan if missing or invalid"""
+    try:
+        return float(approach.get("miss_distance", {}).get("kilometers"))
+    except (TypeError, ValueError):
+        return np.nan
 
 
 def _min_miss_km(item: Dict[str, Any]) -> float:
     """compute smallest miss distance in kilometers for an object's approaches"""
     approaches = item.get("close_approach_data", [])
-    min_km = float("inf")
-    for a in approaches:
-        try:
-            km_str = a.get("miss_distance", {}).get("kilometers")
-            if km_str is None:
-                continue
-            km = float(km_str)
-            if km < min_km:
-                min_km = km
-        except (TypeError, ValueError):
-            continue
-    return min_km
+    kms = np.fromiter((_km_or_nan(a) for a in approaches), dtype=np.float64, count=len(approaches))
+    kms = kms[~np.isnan(kms)]
+    return float(kms.min()) if kms.size else float("inf")
+
+
+# non-metric keys dropped from close_approach_data entries
+_POP_MISS = ("lunar", "miles")
+_POP_REL = ("miles_per_hour", "miles_per_hr")
 
 
 def _sanitise_approach(approach: Dict[str, Any]) -> None:
-    """remove non-metric fields from a close_approach_data entry."""
+    """remove non-metric fields from a close_approach_data entry (NeoWs sends these as dicts)."""
     miss = approach.get("miss_distance")
-    if isinstance(miss, dict):
-        miss.pop("lunar", None)
-        miss.pop("miles", None)
+    if miss is not None:
+        for key in _POP_MISS:
+            miss.pop(key, None)
 
     rel = approach.get("relative_velocity")
-    if isinstance(rel, dict):
-        rel.pop("miles_per_hour", None)
-        rel.pop("miles_per_hr", None)
+    if rel is not None:
+        for key in _POP_REL:
+            rel.pop(key, None)
 
 
 def _simplify_estimated_diameter(obj: Dict[str, Any]) -> None:
@@ -74,8 +117,10 @@ def _simplify_estimated_diameter(obj: Dict[str, Any]) -> None:
 
 def _simplify_object_lookup(obj_lookup: Dict[str, Any], approaches_from_feed: List[Dict[str, Any]]) -> Dict[str, Any]:
     """prepare a version of the full lookup object constrained to the feed approaches."""
-    # make a shallow copy of the lookup data then replace approach list
-    obj_copy = copy.deepcopy(obj_lookup)
+    # shallow copy: lookups are memoised, so the cached record must stay intact.
+    # Only top-level keys are replaced or removed below; the approach entries
+    # sanitised in place come from the browse/feed response, not the lookup.
+    obj_copy = dict(obj_lookup)
     obj_copy["close_approach_data"] = approaches_from_feed or []
 
     # sanitise each approach entry in-place
@@ -107,7 +152,7 @@ def _filter_neo_feed(response_json: Dict[str, Any]) -> List[Dict[str, Any]]:
             if not neo_id:
                 continue
 
-            # lookup full object details (no cache) and then constrain approaches to those in this feed date
+            # lookup full object details (cached) and then constrain approaches to those in this feed date
             obj_lookup = _neo_lookup(neo_id)
             approaches_from_feed = obj.get("close_approach_data", [])
             simplified = _simplify_object_lookup(obj_lookup, approaches_from_feed)
@@ -130,7 +175,10 @@ def get_hazardous_asteroids(start_date: str, end_date: str) -> List[Dict[str, An
 
 
 def lookup_asteroid(asteroid_id: str) -> Dict[str, Any]:
-    """Public helper: lookup a single asteroid by id using NeoWs lookup endpoint."""
+    """Public helper: lookup a single asteroid by id using NeoWs lookup endpoint.
+
+    Returns the shared cached record: treat it as read-only.
+    """
     return _neo_lookup(asteroid_id)
 
 
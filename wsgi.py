@@ -0,0 +1,14 @@
+"""
+WSGI entry point for production servers, e.g.
+
+    gunicorn -c gunicorn.conf.py
+
+With preload_app (set in gunicorn.conf.py) the Flask app, Plotly and the
+compiled orbit kernels are loaded once in the master process and shared
+copy-on-write by the forked workers.
+"""
+
+import meteor_viz
+from app import app
+
+meteor_viz.warm_up()